@@ -5,7 +5,6 @@ CLI for Ethdebug Converter
 
 import argparse
 import sys
-import json
 from pathlib import Path
 from .converter import EthdebugConverter
 
@@ -54,6 +53,19 @@ Examples:
         help='Output format (default: pretty)'
     )
     
+    parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Build and write instructions one at a time to reduce peak memory'
+    )
+    
+    parser.add_argument(
+        '--context-table',
+        action='store_true',
+        help='Write each distinct context once and reference it by index '
+             '(changes the output format)'
+    )
+    
     parser.add_argument(
         '--validate',
         action='store_true',
@@ -79,7 +91,9 @@ Examples:
     environment = "runtime" if args.runtime else "create"
     ethdebug_data = converter.convert(
         contract_name=args.contract,
-        environment=environment
+        environment=environment,
+        stream=args.stream,
+        context_table=args.context_table
     )
     
     if not ethdebug_data:
@@ -107,10 +121,8 @@ Examples:
             sys.exit(1)
     else:
         # Output to stdout
-        if args.format == 'pretty':
-            print(json.dumps(ethdebug_data, indent=2))
-        else:
-            print(json.dumps(ethdebug_data))
+        converter.write(sys.stdout.buffer, ethdebug_data, pretty=args.format == 'pretty')
+        sys.stdout.buffer.write(b"\n")
 
 
 if __name__ == '__main__':
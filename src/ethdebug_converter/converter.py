@@ -3,9 +3,54 @@ Converter from Solidity compiler output to Ethdebug format.
 """
 
 import json
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import chain, islice, repeat
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
-from .parser import SourceMapParser, SourceMapping, parse_bytecode_to_instructions
+from typing import (
+    Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+)
+
+from .parser import (
+    JUMP_TYPES, NO_VALUE, SourceMapColumns, SourceMapParser, split_bytecode
+)
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, fall back to the json module
+    orjson = None
+
+try:
+    import simdjson
+except ImportError:  # simdjson is optional, fall back to orjson or json
+    simdjson = None
+
+# Upper bound on threads used to read source files
+SOURCE_READ_WORKERS = 8
+
+# Inputs at least this large are memory-mapped rather than read into memory
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+
+def _loads(data: Any) -> Any:
+    """Parse JSON from bytes or a buffer with the fastest available parser."""
+    if simdjson is not None:
+        # A parser cannot be reused while its documents are alive
+        return simdjson.Parser().parse(data).as_dict()
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(bytes(data))
+
+
+def load_json(path: Path) -> Any:
+    """Load a JSON file, memory-mapping large inputs."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                    memoryview(mm) as view:
+                return _loads(view)
+        return _loads(f.read())
 
 
 class EthdebugConverter:
@@ -16,12 +61,13 @@ class EthdebugConverter:
         self.solc_json_path = solc_json_path
         self.solc_data: Dict[str, Any] = {}
         self.source_list: List[str] = []
+        self._source_cache: Dict[str, Optional[str]] = {}
         
     def load(self) -> bool:
         """Load and validate Solidity compiler JSON."""
         try:
-            with open(self.solc_json_path, 'r') as f:
-                self.solc_data = json.load(f)
+            self.solc_data = load_json(self.solc_json_path)
+            self._source_cache.clear()
             
             # Get source file list
             self.source_list = self.solc_data.get('sourceList', [])
@@ -30,18 +76,24 @@ class EthdebugConverter:
                 self.source_list = list(self.solc_data['sources'].keys())
                 
             return True
-        except (json.JSONDecodeError, FileNotFoundError) as e:
+        except (ValueError, FileNotFoundError) as e:
             print(f"Error loading file: {e}")
             return False
     
     def convert(self, contract_name: Optional[str] = None, 
-                environment: str = "create") -> Dict[str, Any]:
+                environment: str = "create", stream: bool = False,
+                context_table: bool = False) -> Dict[str, Any]:
         """
         Convert to Ethdebug format.
         
         Args:
             contract_name: Specific contract to convert, or None for first found
             environment: "create" for deployment or "runtime" for runtime
+            stream: Return "instructions" as a one-shot iterator that builds
+                each instruction on demand, for use with write() or save()
+            context_table: Emit each distinct context once in a top-level
+                "contextTable" array and reference it from instructions as
+                {"$ref": index}. This changes the output format.
         """
         if not self.solc_data:
             return {}
@@ -69,6 +121,44 @@ class EthdebugConverter:
         if not contract_data:
             return {}
         
+        return self._convert_contract(
+            contract_key, contract_data, environment, stream, context_table
+        )
+    
+    def convert_all(self, environment: str = "create",
+                    max_workers: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Convert every contract to Ethdebug format.
+        
+        Args:
+            environment: "create" for deployment or "runtime" for runtime
+            max_workers: Number of worker processes to spread contracts over,
+                or None to convert them sequentially. A contract converts in
+                a few milliseconds, less than starting a pool costs, so only
+                opt in for very large inputs. With the spawn start method the
+                caller needs an if __name__ == '__main__' guard.
+        
+        Returns Ethdebug data keyed by contract key ("filename:ContractName").
+        Contracts without bytecode or source map are left out.
+        """
+        contracts = self.solc_data.get('contracts', {})
+        keys = list(contracts)
+        
+        # Conversion is GIL-bound Python, so only processes run contracts in
+        # parallel; with one worker or one contract that is pure overhead
+        if max_workers is None or max_workers < 2 or len(keys) < 2:
+            results = [self._convert_contract(key, contracts[key], environment) for key in keys]
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                     initargs=(self,)) as executor:
+                results = list(executor.map(_convert_in_worker, keys, repeat(environment)))
+        
+        return {key: data for key, data in zip(keys, results) if data}
+    
+    def _convert_contract(self, contract_key: str, contract_data: Dict[str, Any],
+                          environment: str, stream: bool = False,
+                          context_table: bool = False) -> Dict[str, Any]:
+        """Convert a single contract entry from the compiler output."""
         # Extract contract name from key (format: "filename:ContractName")
         actual_contract_name = contract_key.split(':')[-1] if ':' in contract_key else contract_key
         
@@ -83,12 +173,16 @@ class EthdebugConverter:
         if not bytecode or not srcmap:
             return {}
         
-        # Parse bytecode into instructions
-        instructions_list = parse_bytecode_to_instructions(bytecode)
+        # Strip the prefix once, everything below works on bare hex
+        if bytecode.startswith('0x'):
+            bytecode = bytecode[2:]
+        
+        # Split bytecode into instruction offsets
+        starts, ends = split_bytecode(bytecode)
         
         # Parse source mappings
         parser = SourceMapParser(srcmap)
-        mappings = parser.parse()
+        columns = parser.parse_columns()
         
         # Build Ethdebug format
         ethdebug_data = {
@@ -97,26 +191,51 @@ class EthdebugConverter:
             "environment": environment,
             "contract": {
                 "name": actual_contract_name,
-                "bytecode": bytecode if not bytecode.startswith('0x') else bytecode[2:]
+                "bytecode": bytecode
             },
-            "sources": self._build_sources(),
-            "instructions": self._build_instructions(instructions_list, mappings)
+            "sources": self._build_sources()
         }
         
+        contexts: Iterable[Optional[Dict[str, Any]]]
+        if context_table:
+            ethdebug_data["contextTable"], contexts = self._build_context_table(
+                columns, len(starts)
+            )
+        else:
+            contexts = self._iter_contexts(columns, len(starts))
+        
+        # Instructions must stay the last key for write()
+        instructions = self._iter_instructions(bytecode, starts, ends, contexts)
+        ethdebug_data["instructions"] = instructions if stream else list(instructions)
+        
         return ethdebug_data
     
     def _build_sources(self) -> List[Dict[str, Any]]:
         """Build sources array for Ethdebug format."""
-        sources = []
-        for idx, source_file in enumerate(self.source_list):
-            sources.append({
+        # Reads release the GIL, so several source files are read concurrently
+        if len(self.source_list) > 1:
+            workers = min(SOURCE_READ_WORKERS, len(self.source_list))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                contents = list(executor.map(self._get_source_content, self.source_list))
+        else:
+            contents = [self._get_source_content(source_file) for source_file in self.source_list]
+        
+        return [
+            {
                 "id": idx,
                 "path": source_file,
-                "content": self._get_source_content(source_file)
-            })
-        return sources
+                "content": content
+            }
+            for idx, (source_file, content) in enumerate(zip(self.source_list, contents))
+        ]
     
     def _get_source_content(self, source_file: str) -> Optional[str]:
+        """Get source file content, reading it on first use."""
+        if source_file not in self._source_cache:
+            self._source_cache[source_file] = self._read_source_content(source_file)
+        return self._source_cache[source_file]
+    
+    def _read_source_content(self, source_file: str) -> Optional[str]:
         """Try to read source file content if available."""
         # Try to read from relative path
         source_path = self.solc_json_path.parent / source_file
@@ -135,62 +254,166 @@ class EthdebugConverter:
         
         return None
     
-    def _build_instructions(self, instructions: List[Tuple[int, str]], 
-                           mappings: List[SourceMapping]) -> List[Dict[str, Any]]:
-        """Build instructions array with context for Ethdebug format."""
-        ethdebug_instructions = []
-        
-        for idx, (pc, opcode_bytes) in enumerate(instructions):
-            instruction = {
-                "pc": pc,
-                "opcode": opcode_bytes[:2],  # First byte is the opcode
-                "bytes": opcode_bytes
-            }
-            
-            # Add context if we have a corresponding source mapping
-            if idx < len(mappings):
-                mapping = mappings[idx]
-                context = self._build_context(mapping)
-                if context:
-                    instruction["context"] = context
-            
-            ethdebug_instructions.append(instruction)
+    def _iter_instructions(self, bytecode: str, starts: List[int], ends: List[int],
+                           contexts: Iterable[Optional[Dict[str, Any]]]
+                           ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield instructions with context for Ethdebug format.
+        Instruction hex is sliced from the bytecode only here, using the
+        byte offsets from split_bytecode.
+        """
+        # Instructions past the end of the source map get no context
+        padded = chain(contexts, repeat(None))
         
-        return ethdebug_instructions
+        # The pc is the byte offset, hex offsets are twice that
+        for pc, end, context in zip(starts, ends, padded):
+            if context is not None:
+                yield {
+                    "pc": pc,
+                    "opcode": bytecode[2 * pc:2 * pc + 2],  # First byte is the opcode
+                    "bytes": bytecode[2 * pc:2 * end],
+                    "context": context
+                }
+            else:
+                yield {
+                    "pc": pc,
+                    "opcode": bytecode[2 * pc:2 * pc + 2],
+                    "bytes": bytecode[2 * pc:2 * end]
+                }
     
-    def _build_context(self, mapping: SourceMapping) -> Optional[Dict[str, Any]]:
-        """Build context object from source mapping."""
-        if not mapping.has_source_location():
+    def _iter_contexts(self, columns: SourceMapColumns,
+                       count: int) -> Iterator[Optional[Dict[str, Any]]]:
+        """
+        Yield the context for each of the first count mappings.
+        Adjacent identical mappings share one context object.
+        """
+        # Rows are produced lazily, so streaming starts without a full pass
+        prev_row = None
+        context = None
+        for row in islice(zip(*columns), count):
+            if row != prev_row:
+                context = self._build_context(*row)
+                prev_row = row
+            yield context
+    
+    def _build_context_table(self, columns: SourceMapColumns, count: int
+                             ) -> Tuple[List[Dict[str, Any]], List[Optional[Dict[str, Any]]]]:
+        """
+        Collect each distinct context of the first count mappings once.
+        Returns the table and, per mapping, a shared {"$ref": index} or None.
+        """
+        table: List[Dict[str, Any]] = []
+        refs: Dict[Tuple[int, ...], Optional[Dict[str, Any]]] = {}
+        contexts: List[Optional[Dict[str, Any]]] = []
+        prev_row = None
+        ref = None
+        for row in islice(zip(*columns), count):
+            if row != prev_row:
+                if row not in refs:
+                    context = self._build_context(*row)
+                    if context is not None:
+                        refs[row] = {"$ref": len(table)}
+                        table.append(context)
+                    else:
+                        refs[row] = None
+                ref = refs[row]
+                prev_row = row
+            contexts.append(ref)
+        return table, contexts
+    
+    def _build_context(self, start: int, length: int, file_index: int,
+                       jump: int, modifier_depth: int) -> Optional[Dict[str, Any]]:
+        """Build context object from parsed source map fields."""
+        if start < 0 or length < 0 or file_index < 0:
             return None
         
-        context = {
-            "code": {
-                "source": {
-                    "id": mapping.file_index,
-                    "range": {
-                        "start": mapping.start,
-                        "length": mapping.length
-                    }
+        code: Dict[str, Any] = {
+            "source": {
+                "id": file_index,
+                "range": {
+                    "start": start,
+                    "length": length
                 }
             }
         }
         
         # Add jump info if available
-        if mapping.jump_type:
-            context["code"]["jump"] = mapping.jump_type
+        if jump != NO_VALUE:
+            code["jump"] = JUMP_TYPES[jump]
             
         # Add modifier depth if available
-        if mapping.modifier_depth is not None and mapping.modifier_depth > 0:
-            context["code"]["modifierDepth"] = mapping.modifier_depth
+        if modifier_depth > 0:
+            code["modifierDepth"] = modifier_depth
+        
+        return {"code": code}
+    
+    def dumps(self, ethdebug_data: Dict[str, Any], pretty: bool = True) -> bytes:
+        """Serialize Ethdebug format data to JSON bytes."""
+        if orjson is not None:
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(ethdebug_data, option=option)
         
-        return context
+        return json.dumps(ethdebug_data, indent=2 if pretty else None).encode()
+    
+    def write(self, f: BinaryIO, ethdebug_data: Dict[str, Any], pretty: bool = True) -> None:
+        """
+        Write Ethdebug format data as JSON.
+        Instructions from convert(stream=True) are serialized one at a time;
+        pretty output is byte-for-byte the same as dumps() either way.
+        """
+        instructions = ethdebug_data.get("instructions", [])
+        if isinstance(instructions, list):
+            # Already in memory, a single call is faster
+            f.write(self.dumps(ethdebug_data, pretty))
+            return
+        
+        header = {key: value for key, value in ethdebug_data.items() if key != "instructions"}
+        
+        # Reopen the serialized header object to append the array as its last key
+        f.write(self.dumps(header, pretty)[:-1].rstrip())
+        f.write(b',\n  "instructions": [' if pretty else b',"instructions":[')
+        
+        wrote = False
+        for instruction in instructions:
+            item = self.dumps(instruction, pretty)
+            if pretty:
+                # Indent the item to its depth inside the document
+                item = b'\n    ' + item.replace(b'\n', b'\n    ')
+            f.write(b',' + item if wrote else item)
+            wrote = True
+        
+        if pretty:
+            f.write(b'\n  ]\n}' if wrote else b']\n}')
+        else:
+            f.write(b']}')
     
     def save(self, output_path: Path, ethdebug_data: Dict[str, Any]) -> bool:
         """Save Ethdebug format data to file."""
         try:
-            with open(output_path, 'w') as f:
-                json.dump(ethdebug_data, f, indent=2)
+            with open(output_path, 'wb') as f:
+                self.write(f, ethdebug_data)
             return True
         except Exception as e:
             print(f"Error saving file: {e}")
             return False
+
+
+# Converter held by each worker process of EthdebugConverter.convert_all
+_worker_converter: Optional[EthdebugConverter] = None
+
+
+def _init_worker(converter: EthdebugConverter) -> None:
+    """Install the converter shipped to this worker process."""
+    global _worker_converter
+    _worker_converter = converter
+
+
+def _convert_in_worker(contract_key: str, environment: str) -> Dict[str, Any]:
+    """Convert one contract in a worker process."""
+    assert _worker_converter is not None
+    contracts = _worker_converter.solc_data['contracts']
+    return _worker_converter._convert_contract(
+        contract_key, contracts[contract_key], environment
+    )
@@ -10,12 +10,11 @@ Format: s:l:f:j:m
   m - modifier depth
 """
 
-from typing import List, Dict, Optional, Tuple
-from dataclasses import dataclass
+import re
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 
-@dataclass
-class SourceMapping:
+class SourceMapping(NamedTuple):
     """Represents a single source mapping entry."""
     start: Optional[int] = None
     length: Optional[int] = None
@@ -31,6 +30,51 @@ class SourceMapping:
                 self.file_index >= 0)
 
 
+class SourceMapColumns(NamedTuple):
+    """Parsed source map as one list of ints per field."""
+    start: List[int]
+    length: List[int]
+    file_index: List[int]
+    jump: List[int]
+    modifier_depth: List[int]
+
+
+# Sentinels used in parsed source map columns
+NO_VALUE = -1  # field never set
+_INHERIT = -2  # field omitted, carries the previous value forward
+_MAX_DIGITS = 18  # longest digit string that always fits in int64
+_MAX_VALUE = 2 ** 63 - 1  # largest value orjson can serialize
+
+# Jump types are stored as small integer codes
+JUMP_TYPES = ('-', 'i', 'o')
+_JUMP_CODES = {jump: code for code, jump in enumerate(JUMP_TYPES)}
+
+
+def _parse_number(text: str) -> int:
+    """
+    Parse a component that is not a short digit string the way int() does
+    (surrounding whitespace, signs, underscores). Negative, malformed and
+    out-of-range values are treated as omitted.
+    """
+    try:
+        value = int(text)
+    except ValueError:
+        return _INHERIT
+    return value if 0 <= value <= _MAX_VALUE else _INHERIT
+
+
+def _forward_fill(columns: List[List[int]]) -> List[List[int]]:
+    """Replace inherit sentinels in each column with the last explicit value."""
+    for column in columns:
+        prev = NO_VALUE
+        for i, value in enumerate(column):
+            if value == _INHERIT:
+                column[i] = prev
+            else:
+                prev = value
+    return columns
+
+
 class SourceMapParser:
     """Parser for Solidity source mappings."""
     
@@ -41,83 +85,143 @@ class SourceMapParser:
         
     def parse(self) -> List[SourceMapping]:
         """Parse the compressed source mapping string."""
-        if not self.srcmap:
-            return []
-            
-        entries = self.srcmap.split(';')
+        starts, lengths, files, jumps, modifiers = (
+            [None if value < 0 else value for value in column]
+            for column in self.parse_columns()
+        )
         
-        # Previous values for compressed format
-        prev_start = None
-        prev_length = None
-        prev_file = None
-        prev_jump = None
-        prev_modifier = None
-        
-        for entry in entries:
-            if not entry:
-                # Empty entry means use all previous values
-                mapping = SourceMapping(
-                    start=prev_start,
-                    length=prev_length,
-                    file_index=prev_file,
-                    jump_type=prev_jump,
-                    modifier_depth=prev_modifier
-                )
-            else:
-                parts = entry.split(':')
-                
-                # Parse each component, using previous if empty
-                start = self._parse_int(parts[0] if len(parts) > 0 else '') 
-                if start is not None:
-                    prev_start = start
-                else:
-                    start = prev_start
-                    
-                length = self._parse_int(parts[1] if len(parts) > 1 else '')
-                if length is not None:
-                    prev_length = length
-                else:
-                    length = prev_length
-                    
-                file_idx = self._parse_int(parts[2] if len(parts) > 2 else '')
-                if file_idx is not None:
-                    prev_file = file_idx
-                else:
-                    file_idx = prev_file
-                    
-                jump = parts[3] if len(parts) > 3 and parts[3] else None
-                if jump is not None:
-                    prev_jump = jump
-                else:
-                    jump = prev_jump
-                    
-                modifier = self._parse_int(parts[4] if len(parts) > 4 else '')
-                if modifier is not None:
-                    prev_modifier = modifier
-                else:
-                    modifier = prev_modifier
-                
+        # Mappings are immutable, so runs of identical rows share one instance
+        self.mappings = []
+        prev_row = None
+        mapping = SourceMapping()
+        for row in zip(starts, lengths, files, jumps, modifiers):
+            if row != prev_row:
+                start, length, file_idx, jump, modifier = row
                 mapping = SourceMapping(
                     start=start,
                     length=length,
                     file_index=file_idx,
-                    jump_type=jump,
+                    jump_type=None if jump is None else JUMP_TYPES[jump],
                     modifier_depth=modifier
                 )
-            
+                prev_row = row
             self.mappings.append(mapping)
-            
         return self.mappings
     
-    def _parse_int(self, value: str) -> Optional[int]:
-        """Parse integer value from string, handling empty and -1 values."""
-        if not value or value == '':
-            return None
-        try:
-            val = int(value)
-            return val if val >= 0 else None
-        except ValueError:
-            return None
+    def parse_columns(self) -> SourceMapColumns:
+        """
+        Parse the compressed source mapping string into columns.
+        Jump types are stored as indices into JUMP_TYPES, and fields
+        that were never set hold NO_VALUE.
+        """
+        if not self.srcmap:
+            return SourceMapColumns([], [], [], [], [])
+        
+        # One slot per entry; anything not written below inherits
+        count = self.srcmap.count(';') + 1
+        starts = [_INHERIT] * count
+        lengths = [_INHERIT] * count
+        files = [_INHERIT] * count
+        jumps = [_INHERIT] * count
+        modifiers = [_INHERIT] * count
+        
+        # Plain str.split is used on purpose: tokenizing with a precompiled
+        # regex (findall over the whole map) costs as much as this entire loop.
+        # Short digit strings, nearly every component, are converted inline;
+        # isdecimal() admits only strings int() parses (isdigit() lets through
+        # e.g. superscripts). Anything else non-empty goes through
+        # _parse_number, so no component can raise.
+        for idx, entry in enumerate(self.srcmap.split(';')):
+            if not entry:
+                continue
+            
+            # Start offset only, no need to split
+            if ':' not in entry:
+                if len(entry) <= _MAX_DIGITS and entry.isdecimal():
+                    starts[idx] = int(entry)
+                else:
+                    starts[idx] = _parse_number(entry)
+                continue
+            
+            # Split bound: anything past the fifth component is ignored.
+            # Most entries are just "s:l", where a chain of five str.partition
+            # calls is slower than one split plus length guards.
+            parts = entry.split(':', 5)
+            size = len(parts)
+            part = parts[0]
+            if len(part) <= _MAX_DIGITS and part.isdecimal():
+                starts[idx] = int(part)
+            elif part:
+                starts[idx] = _parse_number(part)
+            if size > 1:
+                part = parts[1]
+                if len(part) <= _MAX_DIGITS and part.isdecimal():
+                    lengths[idx] = int(part)
+                elif part:
+                    lengths[idx] = _parse_number(part)
+            if size > 2:
+                part = parts[2]
+                if len(part) <= _MAX_DIGITS and part.isdecimal():
+                    files[idx] = int(part)
+                elif part:
+                    files[idx] = _parse_number(part)
+            if size > 3:
+                jumps[idx] = _JUMP_CODES.get(parts[3].strip(), _INHERIT)
+            if size > 4:
+                part = parts[4]
+                if len(part) <= _MAX_DIGITS and part.isdecimal():
+                    modifiers[idx] = int(part)
+                elif part:
+                    modifiers[idx] = _parse_number(part)
+        
+        return SourceMapColumns(*_forward_fill([starts, lengths, files, jumps, modifiers]))
+
+
+# Immediate byte count per opcode: PUSH1 to PUSH32 (0x60 to 0x7f), zero otherwise
+_PUSH_WIDTH = bytes(op - 0x5f if 0x60 <= op <= 0x7f else 0 for op in range(256))
+
+# Unlinked library placeholders ("__$<hash>$__", or "__LibName___" padded to
+# 40 characters before 0.5) only ever occupy PUSH20 immediates
+_PLACEHOLDER = re.compile(r'__\$[0-9a-fA-F]{34}\$__|__[^$\s]{36}__')
+
+
+def _split_bytes(raw: bytes) -> Tuple[List[int], List[int]]:
+    """Split decoded bytecode into instruction (start, end) byte offsets."""
+    # Indexing bytes yields the opcode as an int, no hex parsing needed
+    push_width = _PUSH_WIDTH
+    size = len(raw)
+    starts = []
+    ends = []
+    i = 0
+    
+    # Only opcode positions are visited, immediates are jumped over
+    while i < size:
+        starts.append(i)
+        i += 1 + push_width[raw[i]]
+        ends.append(i)
+    
+    return starts, ends
+
+
+def split_bytecode(bytecode: str) -> Tuple[List[int], List[int]]:
+    """
+    Split bytecode into instruction byte offsets without slicing it.
+    Expects bare hex without a '0x' prefix.
+    Returns (starts, ends) lists; the pc of each instruction is its
+    start, and its hex is bytecode[2 * start:2 * end].
+    Raises ValueError on anything but hex digits and link placeholders.
+    """
+    # Decode once; a trailing half byte is ignored. Placeholders are zeroed
+    # for decoding only, the instruction hex still comes from the input.
+    hex_body = bytecode[:len(bytecode) & ~1]
+    if '_' in hex_body:
+        hex_body = _PLACEHOLDER.sub('0' * 40, hex_body)
+    raw = bytes.fromhex(hex_body)
+    
+    # fromhex() skips whitespace, which would shift every offset after it
+    if 2 * len(raw) != len(hex_body):
+        raise ValueError("whitespace in bytecode")
+    return _split_bytes(raw)
 
 
 def parse_bytecode_to_instructions(bytecode: str) -> List[Tuple[int, str]]:
@@ -128,34 +232,8 @@ def parse_bytecode_to_instructions(bytecode: str) -> List[Tuple[int, str]]:
     if bytecode.startswith('0x'):
         bytecode = bytecode[2:]
     
-    instructions = []
-    pc = 0
-    i = 0
-    
-    while i < len(bytecode):
-        # Get opcode
-        if i + 2 <= len(bytecode):
-            opcode_hex = bytecode[i:i+2]
-            opcode = int(opcode_hex, 16)
-            
-            # Check if it's a PUSH instruction (0x60 to 0x7f)
-            if 0x60 <= opcode <= 0x7f:
-                # PUSH1 to PUSH32
-                push_bytes = opcode - 0x5f
-                end_idx = i + 2 + (push_bytes * 2)
-                if end_idx <= len(bytecode):
-                    instruction_bytes = bytecode[i:end_idx]
-                else:
-                    instruction_bytes = bytecode[i:]
-                instructions.append((pc, instruction_bytes))
-                pc += 1 + push_bytes
-                i = end_idx
-            else:
-                # Regular instruction
-                instructions.append((pc, opcode_hex))
-                pc += 1
-                i += 2
-        else:
-            break
-            
-    return instructions
+    starts, ends = split_bytecode(bytecode)
+    return [
+        (start, bytecode[2 * start:2 * end])
+        for start, end in zip(starts, ends)
+    ]
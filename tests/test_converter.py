@@ -0,0 +1,207 @@
+"""
+Tests for the Ethdebug converter.
+"""
+
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from ethdebug_converter import EthdebugConverter
+from ethdebug_converter import converter as converter_module
+
+
+EXAMPLES = Path(__file__).resolve().parent.parent / 'examples'
+EXAMPLE_FILES = [
+    EXAMPLES / 'Counter' / '0.8.0' / 'output.json',
+    EXAMPLES / 'TaxCalculator' / '0.8.30' / 'output.json',
+]
+
+
+@pytest.fixture(params=['orjson', 'json'])
+def json_backend(request, monkeypatch):
+    """Run a test once with orjson (when installed) and once with json."""
+    if request.param == 'orjson':
+        pytest.importorskip('orjson')
+    else:
+        monkeypatch.setattr(converter_module, 'orjson', None)
+    return request.param
+
+
+@pytest.fixture(params=['simdjson', 'orjson', 'json'])
+def json_loader(request, monkeypatch):
+    """Force load_json onto each parser in its fallback order."""
+    pytest.importorskip(request.param)
+    if request.param != 'simdjson':
+        monkeypatch.setattr(converter_module, 'simdjson', None)
+    if request.param == 'json':
+        monkeypatch.setattr(converter_module, 'orjson', None)
+    return request.param
+
+
+@pytest.fixture(params=[False, True], ids=['read', 'mmap'])
+def use_mmap(request, monkeypatch):
+    if request.param:
+        monkeypatch.setattr(converter_module, 'MMAP_THRESHOLD', 0)
+    return request.param
+
+
+def load_converter(path):
+    converter = EthdebugConverter(path)
+    assert converter.load()
+    return converter
+
+
+def write_to_bytes(converter, data, pretty):
+    buffer = io.BytesIO()
+    converter.write(buffer, data, pretty)
+    return buffer.getvalue()
+
+
+@pytest.mark.parametrize('path', EXAMPLE_FILES, ids=lambda path: path.parent.parent.name)
+@pytest.mark.parametrize('environment', ['create', 'runtime'])
+def test_streamed_pretty_output_matches_dumps(json_backend, path, environment):
+    converter = load_converter(path)
+    expected = converter.dumps(converter.convert(environment=environment))
+
+    streamed = converter.convert(environment=environment, stream=True)
+
+    assert write_to_bytes(converter, streamed, pretty=True) == expected
+
+
+@pytest.mark.parametrize('path', EXAMPLE_FILES, ids=lambda path: path.parent.parent.name)
+@pytest.mark.parametrize('environment', ['create', 'runtime'])
+def test_streamed_compact_output_matches_dumps(json_backend, path, environment):
+    converter = load_converter(path)
+    expected = converter.dumps(converter.convert(environment=environment), pretty=False)
+
+    streamed = converter.convert(environment=environment, stream=True)
+
+    assert json.loads(write_to_bytes(converter, streamed, pretty=False)) == json.loads(expected)
+
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_streamed_output_without_instructions(json_backend, pretty):
+    converter = load_converter(EXAMPLE_FILES[0])
+    data = converter.convert()
+    data['instructions'] = []
+    expected = converter.dumps(data, pretty)
+
+    streamed = dict(data, instructions=iter([]))
+    output = write_to_bytes(converter, streamed, pretty)
+
+    if pretty:
+        assert output == expected
+    assert json.loads(output) == json.loads(expected)
+
+
+def test_list_output_matches_dumps(json_backend):
+    converter = load_converter(EXAMPLE_FILES[0])
+    data = converter.convert()
+
+    assert write_to_bytes(converter, data, pretty=True) == converter.dumps(data)
+
+
+def resolve_refs(data):
+    """Replace each {"$ref": index} context with its contextTable entry."""
+    table = data['contextTable']
+    instructions = []
+    for instruction in data['instructions']:
+        instruction = dict(instruction)
+        if 'context' in instruction:
+            ref = instruction['context']
+            assert list(ref) == ['$ref']
+            instruction['context'] = table[ref['$ref']]
+        instructions.append(instruction)
+    return instructions
+
+
+def write_solc_json(tmp_path, bytecode, srcmap):
+    path = tmp_path / 'output.json'
+    path.write_text(json.dumps({
+        'contracts': {'Short.sol:Short': {'bin': bytecode, 'srcmap': srcmap}},
+        'sourceList': ['Short.sol'],
+    }))
+    return path
+
+
+@pytest.mark.parametrize('path', EXAMPLE_FILES, ids=lambda path: path.parent.parent.name)
+@pytest.mark.parametrize('environment', ['create', 'runtime'])
+def test_context_table_refs_resolve_to_default_contexts(path, environment):
+    converter = load_converter(path)
+    expected = converter.convert(environment=environment)
+
+    data = converter.convert(environment=environment, context_table=True)
+
+    assert resolve_refs(data) == expected['instructions']
+    # Every table entry is distinct
+    assert len({json.dumps(context, sort_keys=True) for context in data['contextTable']}) \
+        == len(data['contextTable'])
+
+
+@pytest.mark.parametrize('context_table', [False, True])
+def test_instructions_past_source_map_have_no_context(tmp_path, context_table):
+    # PUSH1 0x80, PUSH1 0x40, MSTORE, STOP with only two source map entries
+    converter = load_converter(write_solc_json(tmp_path, '0x608060405200', '0:10:0;2:3:0:i'))
+
+    data = converter.convert(context_table=context_table)
+    instructions = resolve_refs(data) if context_table else data['instructions']
+
+    assert [instruction['pc'] for instruction in instructions] == [0, 2, 4, 5]
+    assert instructions[0]['context'] == {
+        'code': {'source': {'id': 0, 'range': {'start': 0, 'length': 10}}}
+    }
+    assert instructions[1]['context'] == {
+        'code': {'source': {'id': 0, 'range': {'start': 2, 'length': 3}}, 'jump': 'i'}
+    }
+    assert 'context' not in instructions[2]
+    assert 'context' not in instructions[3]
+
+
+def write_multi_contract_json(tmp_path):
+    contracts = {}
+    for path in EXAMPLE_FILES:
+        contracts.update(json.loads(path.read_text())['contracts'])
+    # Interfaces and abstract contracts have no bytecode
+    contracts['Empty.sol:Empty'] = {'bin': '', 'srcmap': ''}
+
+    path = tmp_path / 'output.json'
+    path.write_text(json.dumps({
+        'contracts': contracts,
+        'sourceList': ['Counter.sol', 'TaxCalculator.sol'],
+    }))
+    return path
+
+
+@pytest.mark.parametrize('max_workers', [None, 2])
+@pytest.mark.parametrize('environment', ['create', 'runtime'])
+def test_convert_all_matches_convert(tmp_path, max_workers, environment):
+    converter = load_converter(write_multi_contract_json(tmp_path))
+
+    results = converter.convert_all(environment, max_workers=max_workers)
+
+    assert list(results) == ['Counter.sol:Counter', 'TaxCalculator.sol:TaxCalculator']
+    for key, data in results.items():
+        expected = converter.convert(key.split(':')[-1], environment=environment)
+        assert data == expected
+
+
+@pytest.mark.parametrize('path', EXAMPLE_FILES, ids=lambda path: path.parent.parent.name)
+def test_load_json_matches_json_load(json_loader, use_mmap, path):
+    with open(path) as f:
+        expected = json.load(f)
+
+    assert converter_module.load_json(path) == expected
+
+
+@pytest.mark.parametrize('content', ['{"contracts": {', '', 'not json'])
+def test_load_rejects_invalid_json(json_loader, use_mmap, tmp_path, content):
+    path = tmp_path / 'output.json'
+    path.write_text(content)
+
+    assert EthdebugConverter(path).load() is False
+
+
+def test_load_rejects_missing_file(tmp_path):
+    assert EthdebugConverter(tmp_path / 'missing.json').load() is False
@@ -0,0 +1,130 @@
+"""
+Tests for the source map and bytecode parsers.
+"""
+
+import pytest
+
+from ethdebug_converter.parser import (
+    NO_VALUE,
+    SourceMapColumns,
+    SourceMapParser,
+    SourceMapping,
+    parse_bytecode_to_instructions,
+    split_bytecode,
+)
+
+
+# PUSH20 immediates holding unlinked library placeholders (40 characters each)
+HASH_PLACEHOLDER = '__$' + 'ab' * 17 + '$__'
+LEGACY_PLACEHOLDER = '__Counter.sol:MathLib'.ljust(40, '_')
+
+
+@pytest.mark.parametrize('placeholder', [HASH_PLACEHOLDER, LEGACY_PLACEHOLDER])
+def test_unlinked_library_placeholder(placeholder):
+    bytecode = '6080' + '73' + placeholder + '00'
+    
+    assert parse_bytecode_to_instructions(bytecode) == [
+        (0, '6080'),
+        (2, '73' + placeholder),
+        (23, '00'),
+    ]
+
+
+def test_placeholder_is_not_decoded_as_opcode():
+    # A placeholder full of hex-looking PUSH opcodes must not change the split
+    placeholder = '__$' + '7f' * 17 + '$__'
+    starts, ends = split_bytecode('73' + placeholder + '00')
+    
+    assert starts == [0, 21]
+    assert ends == [21, 22]
+
+
+def test_trailing_half_byte_is_ignored():
+    assert parse_bytecode_to_instructions('60015') == [(0, '6001')]
+
+
+def test_truncated_push_keeps_remaining_bytes():
+    assert parse_bytecode_to_instructions('00' + '6101') == [(0, '00'), (1, '6101')]
+
+
+def test_hex_prefix_is_stripped():
+    assert parse_bytecode_to_instructions('0x6080604052') == [
+        (0, '6080'),
+        (2, '6040'),
+        (4, '52'),
+    ]
+
+
+@pytest.mark.parametrize('bytecode', [
+    '0x6080604052',
+    '6080 604052',
+    '6080604052\n00',
+    '60806040_52',
+    '73__$' + 'ab' * 16 + '$__00',
+])
+def test_invalid_bytecode_raises(bytecode):
+    with pytest.raises(ValueError):
+        split_bytecode(bytecode)
+
+
+@pytest.mark.parametrize('srcmap', [
+    '1:99999999999999999999:0',
+    '1:2:0;99999999999999999999',
+    '1:2:0;3:4:5:-:' + '9' * 40,
+])
+def test_oversized_component_is_omitted(srcmap):
+    columns = SourceMapParser(srcmap).parse_columns()
+    assert max(max(column) for column in columns) < 2 ** 63
+
+
+def test_oversized_component_inherits_previous_value():
+    columns = SourceMapParser('1:2:0;3:' + '9' * 19 + ':0').parse_columns()
+    assert columns.length == [2, 2]
+
+
+def mapping(start=None, length=None, file_index=None, jump_type=None, modifier_depth=None):
+    return SourceMapping(start, length, file_index, jump_type, modifier_depth)
+
+
+@pytest.mark.parametrize('srcmap, expected', [
+    # Empty source map
+    ('', []),
+    # Fields never set stay None
+    ('1:2', [mapping(1, 2)]),
+    # -1 inherits the previous value
+    ('1:2:0:i:1;-1:-1:-1', [mapping(1, 2, 0, 'i', 1)] * 2),
+    ('-1:-1:-1', [mapping()]),
+    # Empty entries and empty components inherit everything
+    ('1:2:0;;3', [mapping(1, 2, 0), mapping(1, 2, 0), mapping(3, 2, 0)]),
+    ('1:2:0;::;:5', [mapping(1, 2, 0), mapping(1, 2, 0), mapping(1, 5, 0)]),
+    # Components past the fifth are ignored
+    ('1:2:0:o:3:9:9', [mapping(1, 2, 0, 'o', 3)]),
+    ('1:2:0:o:3:', [mapping(1, 2, 0, 'o', 3)]),
+    # Unknown jump types are dropped like omitted ones
+    ('1:2:0:x', [mapping(1, 2, 0)]),
+    ('1:2:0:i;3:4:0:jump', [mapping(1, 2, 0, 'i'), mapping(3, 4, 0, 'i')]),
+    # Malformed numbers inherit the previous value
+    ('1:2:0;a:x:²', [mapping(1, 2, 0)] * 2),
+    # Anything int() accepts is still parsed
+    ('1:2:0;+3: 4:1_0', [mapping(1, 2, 0), mapping(3, 4, 10)]),
+    ('1:2:0\n', [mapping(1, 2, 0)]),
+    ('1:2:0:o\n', [mapping(1, 2, 0, 'o')]),
+    ('1:2:0;7\n', [mapping(1, 2, 0), mapping(7, 2, 0)]),
+    ('1:2:0;' + '9' * 18 + ':' + str(2 ** 63 - 1), [
+        mapping(1, 2, 0), mapping(10 ** 18 - 1, 2 ** 63 - 1, 0),
+    ]),
+])
+def test_parse(srcmap, expected):
+    assert SourceMapParser(srcmap).parse() == expected
+
+
+@pytest.mark.parametrize('srcmap, expected', [
+    ('', ([], [], [], [], [])),
+    ('1:2', ([1], [2], [NO_VALUE], [NO_VALUE], [NO_VALUE])),
+    ('1:2:0:i:1;-1:-1:-1', ([1, 1], [2, 2], [0, 0], [1, 1], [1, 1])),
+    ('1:2:0;;::;:5', ([1, 1, 1, 1], [2, 2, 2, 5], [0, 0, 0, 0], [NO_VALUE] * 4, [NO_VALUE] * 4)),
+    ('1:2:0:o:3:9:9', ([1], [2], [0], [2], [3])),
+    ('1:2:0:-;3:4:0:x', ([1, 3], [2, 4], [0, 0], [0, 0], [NO_VALUE] * 2)),
+])
+def test_parse_columns(srcmap, expected):
+    assert SourceMapParser(srcmap).parse_columns() == SourceMapColumns(*expected)